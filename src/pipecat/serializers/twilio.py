@@ -11,7 +11,7 @@ from pydantic import BaseModel
 
 from pipecat.frames.frames import AudioRawFrame, Frame
 from pipecat.serializers.base_serializer import FrameSerializer
-from pipecat.utils.audio import ulaw_to_pcm, pcm_to_ulaw
+from pipecat.utils.audio import PcmToUlawStream, UlawToPcmStream
 
 
 class TwilioFrameSerializer(FrameSerializer):
@@ -27,13 +27,23 @@ class TwilioFrameSerializer(FrameSerializer):
         self._stream_sid = stream_sid
         self._params = params
 
+        # Audio is converted as a continuous stream in both directions, so we
+        # keep the resampler state between frames.
+        self._pcm_to_ulaw: PcmToUlawStream | None = None
+        self._pcm_to_ulaw_sample_rate = 0
+        self._ulaw_to_pcm = UlawToPcmStream(params.twilio_sample_rate, params.sample_rate)
+
     def serialize(self, frame: Frame) -> str | bytes | None:
         if not isinstance(frame, AudioRawFrame):
             return None
 
         data = frame.audio
 
-        serialized_data = pcm_to_ulaw(data, frame.sample_rate, self._params.twilio_sample_rate)
+        if not self._pcm_to_ulaw or self._pcm_to_ulaw_sample_rate != frame.sample_rate:
+            self._pcm_to_ulaw = PcmToUlawStream(frame.sample_rate, self._params.twilio_sample_rate)
+            self._pcm_to_ulaw_sample_rate = frame.sample_rate
+
+        serialized_data = self._pcm_to_ulaw.convert(data)
         payload = base64.b64encode(serialized_data).decode("utf-8")
         answer = {
             "event": "media",
@@ -54,10 +64,7 @@ class TwilioFrameSerializer(FrameSerializer):
             payload_base64 = message["media"]["payload"]
             payload = base64.b64decode(payload_base64)
 
-            deserialized_data = ulaw_to_pcm(
-                payload,
-                self._params.twilio_sample_rate,
-                self._params.sample_rate)
+            deserialized_data = self._ulaw_to_pcm.convert(payload)
             audio_frame = AudioRawFrame(
                 audio=deserialized_data,
                 num_channels=1,
@@ -4,7 +4,6 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-import io
 import struct
 
 from typing import AsyncGenerator
@@ -25,6 +24,24 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module: {e}")
 
 
+# WAV sub-chunk header: chunk ID and chunk size.
+WAV_CHUNK_HEADER = struct.Struct('<4sI')
+
+
+def find_wav_audio_offset(wav: bytes | bytearray) -> int | None:
+    # Sub-chunks start right after the RIFF header and the "fmt " sub-chunk (36
+    # bytes). We skip any other sub-chunk until we find the "data" one.
+    offset = 36
+    while offset + WAV_CHUNK_HEADER.size <= len(wav):
+        (chunk_id, size) = WAV_CHUNK_HEADER.unpack_from(wav, offset)
+        offset += WAV_CHUNK_HEADER.size
+        if chunk_id == b'data':
+            return offset
+        offset += size
+    # We haven't received the whole header yet.
+    return None
+
+
 class PlayHTTTSService(TTSService):
 
     def __init__(self, *, api_key: str, user_id: str, voice_url: str, **kwargs):
@@ -67,21 +84,17 @@ class PlayHTTTSService(TTSService):
                 # skip the RIFF header.
                 if in_header:
                     b.extend(chunk)
-                    if len(b) <= 36:
+                    offset = find_wav_audio_offset(b)
+                    if offset is None:
                         continue
-                    else:
-                        fh = io.BytesIO(b)
-                        fh.seek(36)
-                        (data, size) = struct.unpack('<4sI', fh.read(8))
-                        while data != b'data':
-                            fh.read(size)
-                            (data, size) = struct.unpack('<4sI', fh.read(8))
-                        in_header = False
-                else:
-                    if len(chunk):
-                        await self.stop_ttfb_metrics()
-                        frame = AudioRawFrame(chunk, 16000, 1)
-                        yield frame
+                    in_header = False
+                    # The rest of the buffer is already audio.
+                    chunk = bytes(b[offset:])
+
+                if len(chunk):
+                    await self.stop_ttfb_metrics()
+                    frame = AudioRawFrame(chunk, 16000, 1)
+                    yield frame
             await self.push_frame(TTSStoppedFrame())
         except Exception as e:
             logger.exception(f"{self} error generating TTS: {e}")
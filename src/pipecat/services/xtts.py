@@ -5,6 +5,9 @@
 #
 
 import aiohttp
+import functools
+import json
+import math
 
 from typing import Any, AsyncGenerator, Dict
 
@@ -21,12 +24,111 @@ from loguru import logger
 
 import numpy as np
 
-try:
-    import resampy
-except ModuleNotFoundError as e:
-    logger.error(f"Exception: {e}")
-    logger.error("In order to use XTTS, you need to `pip install pipecat-ai[xtts]`.")
-    raise Exception(f"Missing module: {e}")
+from scipy.signal import firwin, resample_poly
+
+
+# XTTS always streams 24000 Hz PCM.
+XTTS_SAMPLE_RATE = 24000
+
+# Minimum number of 24000 Hz samples (0.25 seconds) we accumulate before
+# resampling, so the per-call overhead is amortized over enough audio.
+MIN_RESAMPLE_SAMPLES = 6000
+
+
+@functools.lru_cache(maxsize=8)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    # Polyphase low-pass filter for the given resampling ratio. Ratios are
+    # fixed per service so we only design it once.
+    max_rate = max(up, down)
+    return firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 8.0)).astype(np.float32)
+
+
+class XTTSResampler:
+    """Resamples a stream of 24000 Hz PCM chunks to the given sample rate.
+
+    Consecutive chunks are resampled with some overlapping context samples so
+    the filter always sees a continuous signal and no clicks are introduced at
+    chunk boundaries. If the output sample rate is 24000 Hz audio is returned
+    as is.
+
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        gcd = math.gcd(XTTS_SAMPLE_RATE, sample_rate)
+        self._up = sample_rate // gcd
+        self._down = XTTS_SAMPLE_RATE // gcd
+        self._passthrough = self._up == self._down
+        self._filter = resample_filter(self._up, self._down) if not self._passthrough else None
+        # Number of input samples of context needed on each side of a chunk. It
+        # needs to cover half of the filter (in input samples) and be a
+        # multiple of `_down` so a chunk maps to a whole number of output
+        # samples.
+        half_filter_samples = 10 * max(self._up, self._down) / self._up
+        self._context_samples = self._down * (math.ceil(half_filter_samples / self._down) + 1)
+
+        self._audio = np.empty(0, dtype=np.int16)
+        # Number of samples at the beginning of `_audio` that have already been
+        # resampled and are only kept as context.
+        self._context = 0
+        # Output samples are converted back to int16 here, so we don't need to
+        # allocate a new array for every chunk.
+        self._output = np.empty(0, dtype=np.int16)
+
+    def resample(self, audio: bytes) -> bytes:
+        if self._passthrough:
+            return audio
+
+        self._audio = np.concatenate((self._audio, np.frombuffer(audio, dtype=np.int16)))
+
+        # We hold back the last samples since their output also depends on
+        # samples we haven't received yet.
+        size = self._audio.size - self._context - self._context_samples
+        size -= size % self._down
+        if size <= 0:
+            return b""
+
+        end = self._context + size
+        resampled_audio = self._resample(self._audio[:end + self._context_samples], size)
+
+        # Keep the last resampled samples as context for the next chunk.
+        start = max(0, end - self._context_samples)
+        self._audio = self._audio[start:]
+        self._context = end - start
+
+        return resampled_audio
+
+    def flush(self, audio: bytes = b"") -> bytes:
+        if self._passthrough:
+            return audio
+
+        self._audio = np.concatenate((self._audio, np.frombuffer(audio, dtype=np.int16)))
+
+        size = self._audio.size - self._context
+        resampled_audio = self._resample(self._audio, size) if size > 0 else b""
+
+        self._audio = np.empty(0, dtype=np.int16)
+        self._context = 0
+
+        return resampled_audio
+
+    def _resample(self, audio_np: np.ndarray, size: int) -> bytes:
+        resampled_audio = resample_poly(
+            audio_np.astype(np.float32), self._up, self._down, window=self._filter)
+        # Skip the output of the context samples.
+        start = self._context * self._up // self._down
+        end = start + (size * self._up + self._down - 1) // self._down
+        resampled_audio = resampled_audio[start:end]
+
+        # `resampled_audio` is ours, so round and clip it in place.
+        np.rint(resampled_audio, out=resampled_audio)
+        np.clip(resampled_audio, -32768, 32767, out=resampled_audio)
+
+        if self._output.size < resampled_audio.size:
+            self._output = np.empty(resampled_audio.size, dtype=np.int16)
+        output = self._output[:resampled_audio.size]
+        np.copyto(output, resampled_audio, casting="unsafe")
+
+        return output.tobytes()
 
 
 # The server below can connect to XTTS through a local running docker
@@ -46,6 +148,7 @@ class XTTSService(TTSService):
             language: str,
             base_url: str,
             aiohttp_session: aiohttp.ClientSession,
+            sample_rate: int = 16000,
             **kwargs):
         super().__init__(**kwargs)
 
@@ -53,7 +156,9 @@ class XTTSService(TTSService):
         self._language = language
         self._base_url = base_url
         self._studio_speakers: Dict[str, Any] | None = None
+        self._studio_speakers_json: Dict[str, str] = {}
         self._aiohttp_session = aiohttp_session
+        self._sample_rate = sample_rate
 
     def can_generate_metrics(self) -> bool:
         return True
@@ -69,11 +174,23 @@ class XTTSService(TTSService):
                     ErrorFrame(f"Error error getting studio speakers (status: {r.status}, error: {text})"))
                 return
             self._studio_speakers = await r.json()
+            self._studio_speakers_json = {}
 
     async def set_voice(self, voice: str):
         logger.debug(f"Switching TTS voice to: [{voice}]")
         self._voice_id = voice
 
+    def _speaker_embeddings_json(self, voice_id: str) -> str:
+        # Speaker embeddings are large and never change, so we only serialize
+        # them once per voice instead of on every request.
+        if voice_id not in self._studio_speakers_json:
+            embeddings = self._studio_speakers[voice_id]
+            self._studio_speakers_json[voice_id] = json.dumps({
+                "speaker_embedding": embeddings["speaker_embedding"],
+                "gpt_cond_latent": embeddings["gpt_cond_latent"],
+            })
+        return self._studio_speakers_json[voice_id]
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
 
@@ -81,22 +198,24 @@ class XTTSService(TTSService):
             logger.error(f"{self} no studio speakers available")
             return
 
-        embeddings = self._studio_speakers[self._voice_id]
+        embeddings_json = self._speaker_embeddings_json(self._voice_id)
 
         url = self._base_url + "/tts_stream"
 
-        payload = {
+        payload = json.dumps({
             "text": text.replace('.', '').replace('*', ''),
             "language": self._language,
-            "speaker_embedding": embeddings["speaker_embedding"],
-            "gpt_cond_latent": embeddings["gpt_cond_latent"],
             "add_wav_header": False,
             "stream_chunk_size": 20,
-        }
+        })
+
+        # Splice the pre-serialized speaker embeddings into the request object.
+        data = payload[:-1] + ", " + embeddings_json[1:]
 
         await self.start_ttfb_metrics()
 
-        async with self._aiohttp_session.post(url, json=payload) as r:
+        headers = {"Content-Type": "application/json"}
+        async with self._aiohttp_session.post(url, data=data, headers=headers) as r:
             if r.status != 200:
                 text = await r.text()
                 logger.error(f"{self} error getting audio (status: {r.status}, error: {text})")
@@ -107,6 +226,7 @@ class XTTSService(TTSService):
 
             await self.push_frame(TTSStartedFrame())
 
+            resampler = XTTSResampler(self._sample_rate)
             buffer = bytearray()
             async for chunk in r.content.iter_chunked(1024):
                 if len(chunk) > 0:
@@ -115,28 +235,27 @@ class XTTSService(TTSService):
                     buffer.extend(chunk)
 
                     # Check if buffer has enough data for processing
-                    while len(buffer) >= 48000:  # Assuming at least 0.5 seconds of audio data at 24000 Hz
-                        # Process the buffer up to a safe size for resampling
-                        process_data = buffer[:48000]
+                    if len(buffer) >= MIN_RESAMPLE_SAMPLES * 2:
+                        # Process all the complete samples we have, a trailing
+                        # odd byte (if any) stays in the buffer.
+                        size = len(buffer) - len(buffer) % 2
+                        process_data = bytes(buffer[:size])
                         # Remove processed data from buffer
-                        buffer = buffer[48000:]
-
-                        # Convert the byte data to numpy array for resampling
-                        audio_np = np.frombuffer(process_data, dtype=np.int16)
-                        # Resample the audio from 24000 Hz to 16000 Hz
-                        resampled_audio = resampy.resample(audio_np, 24000, 16000)
-                        # Convert the numpy array back to bytes
-                        resampled_audio_bytes = resampled_audio.astype(np.int16).tobytes()
-                        # Create the frame with the resampled audio
-                        frame = AudioRawFrame(resampled_audio_bytes, 16000, 1)
-                        yield frame
+                        del buffer[:size]
+
+                        # Resample the audio from 24000 Hz to the output
+                        # sample rate
+                        resampled_audio_bytes = resampler.resample(process_data)
+                        if resampled_audio_bytes:
+                            # Create the frame with the resampled audio
+                            frame = AudioRawFrame(resampled_audio_bytes, self._sample_rate, 1)
+                            yield frame
 
             # Process any remaining data in the buffer
-            if len(buffer) > 0:
-                audio_np = np.frombuffer(buffer, dtype=np.int16)
-                resampled_audio = resampy.resample(audio_np, 24000, 16000)
-                resampled_audio_bytes = resampled_audio.astype(np.int16).tobytes()
-                frame = AudioRawFrame(resampled_audio_bytes, 16000, 1)
+            size = len(buffer) - len(buffer) % 2
+            resampled_audio_bytes = resampler.flush(bytes(buffer[:size]))
+            if resampled_audio_bytes:
+                frame = AudioRawFrame(resampled_audio_bytes, self._sample_rate, 1)
                 yield frame
 
             await self.push_frame(TTSStoppedFrame())
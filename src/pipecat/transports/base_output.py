@@ -186,11 +186,19 @@ class BaseOutputTransport(FrameProcessor):
             await self._audio_out_queue.put(frame)
         else:
             self._audio_buffer.extend(frame.audio)
-            while len(self._audio_buffer) >= self._audio_chunk_size:
-                chunk = AudioRawFrame(bytes(self._audio_buffer[:self._audio_chunk_size]),
-                                      sample_rate=frame.sample_rate, num_channels=frame.num_channels)
-                await self._sink_queue.put(chunk)
-                self._audio_buffer = self._audio_buffer[self._audio_chunk_size:]
+            # We walk the buffer with a memoryview so each chunk is only copied
+            # once, and then remove all the consumed audio at once. Otherwise,
+            # long audio frames would be copied over and over.
+            offset = 0
+            try:
+                with memoryview(self._audio_buffer) as audio:
+                    while len(audio) - offset >= self._audio_chunk_size:
+                        chunk = AudioRawFrame(bytes(audio[offset:offset + self._audio_chunk_size]),
+                                              sample_rate=frame.sample_rate, num_channels=frame.num_channels)
+                        await self._sink_queue.put(chunk)
+                        offset += self._audio_chunk_size
+            finally:
+                del self._audio_buffer[:offset]
 
     async def _handle_image(self, frame: ImageRawFrame | SpriteFrame):
         if not self._params.camera_out_enabled:
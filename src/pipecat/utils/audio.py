@@ -5,9 +5,12 @@
 #
 
 import audioop
+import functools
 import numpy as np
 import pyloudnorm as pyln
 
+from scipy.signal import sosfilt
+
 
 def normalize_value(value, min_value, max_value):
     normalized = (value - min_value) / (max_value - min_value)
@@ -15,13 +18,33 @@ def normalize_value(value, min_value, max_value):
     return normalized_clamped
 
 
+@functools.lru_cache(maxsize=8)
+def _get_k_weighting_filter(sample_rate: int) -> np.ndarray:
+    # These are the same K-weighting filter stages used by `pyln.Meter`, as
+    # second-order sections so they can be applied in a single pass.
+    high_shelf = pyln.IIRfilter(4.0, 1 / np.sqrt(2), 1500.0, sample_rate, "high_shelf")
+    high_pass = pyln.IIRfilter(0.0, 0.5, 38.0, sample_rate, "high_pass")
+    sos = np.array([np.concatenate((f.b, f.a)) for f in (high_shelf, high_pass)])
+    # Single precision is more than enough for a loudness estimate and keeps
+    # the filtered audio in float32.
+    return sos.astype(np.float32)
+
+
 def calculate_audio_volume(audio: bytes, sample_rate: int) -> float:
     audio_np = np.frombuffer(audio, dtype=np.int16)
-    audio_float = audio_np.astype(np.float64)
+    audio_float = audio_np.astype(np.float32)
 
-    block_size = audio_np.size / sample_rate
-    meter = pyln.Meter(sample_rate, block_size=block_size)
-    loudness = meter.integrated_loudness(audio_float)
+    # This is the integrated loudness (ITU-R BS.1770) of the whole audio as a
+    # single gating block. It's what `pyln.Meter` computes when the block size
+    # is the audio duration, without creating a meter on every call.
+    audio_float = sosfilt(_get_k_weighting_filter(sample_rate), audio_float)
+    mean_square = np.mean(np.square(audio_float, out=audio_float), dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10.0 * np.log10(mean_square)
+
+    # Audio below the absolute gating threshold (-70 LUFS) is silence.
+    if loudness < -70.0:
+        loudness = -np.inf
 
     # Loudness goes from -20 to 80 (more or less), where -20 is quiet and 80 is
     # loud.
@@ -34,21 +57,57 @@ def exp_smoothing(value: float, prev_value: float, factor: float) -> float:
     return prev_value + factor * (value - prev_value)
 
 
-def ulaw_to_pcm(ulaw_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
-    # Convert μ-law to PCM
-    in_pcm_bytes = audioop.ulaw2lin(ulaw_bytes, 2)
+class UlawToPcmStream:
+    """Converts a stream of μ-law chunks to PCM.
 
-    # Resample
-    out_pcm_bytes = audioop.ratecv(in_pcm_bytes, 2, 1, in_sample_rate, out_sample_rate, None)[0]
+    The resampler state is kept between chunks, so consecutive chunks are
+    resampled as a continuous signal.
 
-    return out_pcm_bytes
+    """
 
+    def __init__(self, in_sample_rate: int, out_sample_rate: int):
+        self._in_sample_rate = in_sample_rate
+        self._out_sample_rate = out_sample_rate
+        self._state = None
 
-def pcm_to_ulaw(pcm_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
-    # Resample
-    in_pcm_bytes = audioop.ratecv(pcm_bytes, 2, 1, in_sample_rate, out_sample_rate, None)[0]
+    def convert(self, ulaw_bytes: bytes) -> bytes:
+        # Convert μ-law to PCM
+        in_pcm_bytes = audioop.ulaw2lin(ulaw_bytes, 2)
+
+        # Resample
+        out_pcm_bytes, self._state = audioop.ratecv(
+            in_pcm_bytes, 2, 1, self._in_sample_rate, self._out_sample_rate, self._state)
+
+        return out_pcm_bytes
+
+
+class PcmToUlawStream:
+    """Converts a stream of PCM chunks to μ-law.
 
-    # Convert PCM to μ-law
-    ulaw_bytes = audioop.lin2ulaw(in_pcm_bytes, 2)
+    The resampler state is kept between chunks, so consecutive chunks are
+    resampled as a continuous signal.
 
-    return ulaw_bytes
+    """
+
+    def __init__(self, in_sample_rate: int, out_sample_rate: int):
+        self._in_sample_rate = in_sample_rate
+        self._out_sample_rate = out_sample_rate
+        self._state = None
+
+    def convert(self, pcm_bytes: bytes) -> bytes:
+        # Resample
+        in_pcm_bytes, self._state = audioop.ratecv(
+            pcm_bytes, 2, 1, self._in_sample_rate, self._out_sample_rate, self._state)
+
+        # Convert PCM to μ-law
+        ulaw_bytes = audioop.lin2ulaw(in_pcm_bytes, 2)
+
+        return ulaw_bytes
+
+
+def ulaw_to_pcm(ulaw_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
+    return UlawToPcmStream(in_sample_rate, out_sample_rate).convert(ulaw_bytes)
+
+
+def pcm_to_ulaw(pcm_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
+    return PcmToUlawStream(in_sample_rate, out_sample_rate).convert(pcm_bytes)
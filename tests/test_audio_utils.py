@@ -0,0 +1,71 @@
+import audioop
+import unittest
+
+import numpy as np
+import pyloudnorm as pyln
+
+from pipecat.utils.audio import (
+    PcmToUlawStream,
+    UlawToPcmStream,
+    calculate_audio_volume,
+    normalize_value,
+    pcm_to_ulaw,
+    ulaw_to_pcm)
+
+
+def pyloudnorm_audio_volume(audio: bytes, sample_rate: int) -> float:
+    audio_np = np.frombuffer(audio, dtype=np.int16)
+    meter = pyln.Meter(sample_rate, block_size=audio_np.size / sample_rate)
+    loudness = meter.integrated_loudness(audio_np.astype(np.float64))
+    return normalize_value(loudness, -20, 80)
+
+
+class TestCalculateAudioVolume(unittest.TestCase):
+    def test_matches_pyloudnorm(self):
+        rng = np.random.default_rng(0)
+        for sample_rate in [8000, 16000, 24000]:
+            for size in [160, 320, 512, 1600, 4000]:
+                for amplitude in [0, 1, 3, 30, 300, 3000, 30000]:
+                    audio = (rng.standard_normal(size) * amplitude).clip(-32768, 32767)
+                    audio = audio.astype(np.int16).tobytes()
+                    with self.subTest(sample_rate=sample_rate, size=size, amplitude=amplitude):
+                        self.assertAlmostEqual(
+                            calculate_audio_volume(audio, sample_rate),
+                            pyloudnorm_audio_volume(audio, sample_rate),
+                            delta=1e-5)
+
+    def test_silence(self):
+        audio = np.zeros(1600, dtype=np.int16).tobytes()
+        self.assertEqual(calculate_audio_volume(audio, 16000), 0.0)
+
+
+class TestUlawStreams(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pcm = (rng.standard_normal(16000) * 8000).clip(-32768, 32767).astype(np.int16).tobytes()
+        self.ulaw = audioop.lin2ulaw(self.pcm, 2)
+
+    def test_pcm_to_ulaw_stream_matches_one_shot(self):
+        stream = PcmToUlawStream(16000, 8000)
+        chunks = [self.pcm[i:i + 640] for i in range(0, len(self.pcm), 640)]
+        output = b"".join(stream.convert(chunk) for chunk in chunks)
+        self.assertEqual(output, pcm_to_ulaw(self.pcm, 16000, 8000))
+
+    def test_ulaw_to_pcm_stream_matches_one_shot(self):
+        stream = UlawToPcmStream(8000, 16000)
+        chunks = [self.ulaw[i:i + 160] for i in range(0, len(self.ulaw), 160)]
+        output = b"".join(stream.convert(chunk) for chunk in chunks)
+        self.assertEqual(output, ulaw_to_pcm(self.ulaw, 8000, 16000))
+
+    def test_pcm_to_ulaw(self):
+        resampled = audioop.ratecv(self.pcm, 2, 1, 16000, 8000, None)[0]
+        self.assertEqual(pcm_to_ulaw(self.pcm, 16000, 8000), audioop.lin2ulaw(resampled, 2))
+
+    def test_ulaw_to_pcm(self):
+        pcm = audioop.ulaw2lin(self.ulaw, 2)
+        resampled = audioop.ratecv(pcm, 2, 1, 8000, 16000, None)[0]
+        self.assertEqual(ulaw_to_pcm(self.ulaw, 8000, 16000), resampled)
+
+
+if __name__ == "__main__":
+    unittest.main()
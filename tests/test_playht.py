@@ -0,0 +1,31 @@
+import struct
+import unittest
+
+from pipecat.services.playht import find_wav_audio_offset
+
+
+def wav_header() -> bytes:
+    fmt = struct.pack('<HHIIHH', 1, 1, 16000, 32000, 2, 16)
+    return (b'RIFF' + struct.pack('<I', 0) + b'WAVE' +
+            b'fmt ' + struct.pack('<I', len(fmt)) + fmt +
+            b'LIST' + struct.pack('<I', 4) + b'INFO' +
+            b'data' + struct.pack('<I', 0))
+
+
+class TestFindWavAudioOffset(unittest.TestCase):
+    def test_header_split_at_every_offset(self):
+        header = wav_header()
+        wav = header + b'\x01\x02' * 10
+        self.assertEqual(len(header), 56)
+
+        for size in range(len(wav) + 1):
+            with self.subTest(size=size):
+                offset = find_wav_audio_offset(wav[:size])
+                if size < len(header):
+                    self.assertIsNone(offset)
+                else:
+                    self.assertEqual(offset, 56)
+
+
+if __name__ == "__main__":
+    unittest.main()
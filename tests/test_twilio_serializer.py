@@ -0,0 +1,60 @@
+import base64
+import json
+import unittest
+
+import numpy as np
+
+from pipecat.frames.frames import AudioRawFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+from pipecat.utils.audio import pcm_to_ulaw, ulaw_to_pcm
+
+
+def media_message(ulaw: bytes) -> str:
+    return json.dumps({
+        "event": "media",
+        "media": {
+            "payload": base64.b64encode(ulaw).decode("utf-8")
+        }
+    })
+
+
+def media_payload(message: str) -> bytes:
+    return base64.b64decode(json.loads(message)["media"]["payload"])
+
+
+class TestTwilioFrameSerializer(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pcm = (rng.standard_normal(16000) * 8000).clip(-32768, 32767).astype(np.int16).tobytes()
+
+    def test_serialize_chunks_matches_one_shot(self):
+        serializer = TwilioFrameSerializer("stream_sid")
+        chunks = [self.pcm[i:i + 640] for i in range(0, len(self.pcm), 640)]
+
+        output = b"".join(
+            media_payload(serializer.serialize(AudioRawFrame(chunk, 16000, 1)))
+            for chunk in chunks)
+
+        self.assertEqual(output, pcm_to_ulaw(self.pcm, 16000, 8000))
+
+    def test_serialize_sample_rate_change(self):
+        serializer = TwilioFrameSerializer("stream_sid")
+        serializer.serialize(AudioRawFrame(self.pcm[:640], 16000, 1))
+
+        output = media_payload(serializer.serialize(AudioRawFrame(self.pcm, 24000, 1)))
+
+        self.assertEqual(output, pcm_to_ulaw(self.pcm, 24000, 8000))
+
+    def test_deserialize_chunks_matches_one_shot(self):
+        serializer = TwilioFrameSerializer("stream_sid")
+        ulaw = pcm_to_ulaw(self.pcm, 16000, 8000)
+        chunks = [ulaw[i:i + 160] for i in range(0, len(ulaw), 160)]
+
+        frames = [serializer.deserialize(media_message(chunk)) for chunk in chunks]
+
+        self.assertTrue(all(frame.sample_rate == 16000 for frame in frames))
+        self.assertEqual(b"".join(frame.audio for frame in frames), ulaw_to_pcm(ulaw, 8000, 16000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from scipy.signal import resample_poly
+
+from pipecat.services.xtts import XTTSResampler, resample_filter
+
+
+def one_shot_resample(audio: np.ndarray, up: int, down: int) -> bytes:
+    resampled_audio = resample_poly(
+        audio.astype(np.float32), up, down, window=resample_filter(up, down))
+    return np.clip(np.rint(resampled_audio), -32768, 32767).astype(np.int16).tobytes()
+
+
+def stream_resample(resampler: XTTSResampler, audio: bytes, chunk_sizes) -> bytes:
+    output = b""
+    offset = 0
+    for size in chunk_sizes:
+        output += resampler.resample(audio[offset:offset + size])
+        offset += size
+    output += resampler.flush(audio[offset:])
+    return output
+
+
+class TestXTTSResampler(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.audio = (rng.standard_normal(100000) * 8000).clip(-32768, 32767).astype(np.int16)
+
+    def test_streaming_matches_one_shot(self):
+        # Chunk sizes in bytes, they don't need to be a multiple of the
+        # resampling ratio.
+        chunk_sizes = [20, 3000, 6002, 100000]
+        audio = self.audio.tobytes()
+
+        output = stream_resample(XTTSResampler(), audio, chunk_sizes)
+
+        self.assertEqual(output, one_shot_resample(self.audio, 2, 3))
+
+    def test_streaming_first_chunk_smaller_than_context(self):
+        audio = self.audio[:6000]
+
+        output = stream_resample(XTTSResampler(), audio.tobytes(), [80, 5920])
+
+        self.assertEqual(len(output), 4000 * 2)
+        self.assertEqual(output, one_shot_resample(audio, 2, 3))
+
+    def test_streaming_matches_one_shot_other_sample_rates(self):
+        chunk_sizes = [20, 3000, 6002, 100000]
+        audio = self.audio.tobytes()
+
+        for sample_rate, up, down in [(8000, 1, 3), (22050, 147, 160), (44100, 147, 80)]:
+            with self.subTest(sample_rate=sample_rate):
+                output = stream_resample(XTTSResampler(sample_rate), audio, chunk_sizes)
+                self.assertEqual(output, one_shot_resample(self.audio, up, down))
+
+    def test_passthrough(self):
+        chunk_sizes = [20, 3000, 6002, 100000]
+        audio = self.audio.tobytes()
+
+        output = stream_resample(XTTSResampler(24000), audio, chunk_sizes)
+
+        self.assertEqual(output, audio)
+
+
+if __name__ == "__main__":
+    unittest.main()